@@ -7,16 +7,87 @@ Resolves source repository URLs for Maven artifacts from an input file.
 import sys
 import json
 import csv
-import subprocess
+import importlib.util
+import sqlite3
+import threading
 import time
-from datetime import datetime
+from contextlib import closing
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import argparse
 import concurrent.futures
-import os
+import itertools
+
+def _load_resolver(path: str):
+    """Import the get-repo-url.py resolver script as a module."""
+    spec = importlib.util.spec_from_file_location("get_repo_url", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Resolver module, pooled HTTP session and cache settings for the current process, set by _init_worker
+_resolver = None
+_session = None
+_cache_db = None
+_cache_ttl_seconds = 0
+_cache_refresh = False
+_cache_local = threading.local()
+
+def _init_worker(resolver_path: str, cache_db: Optional[str] = None,
+                 cache_ttl_days: int = 30, refresh: bool = False):
+    """Load the resolver and its HTTP session once per worker process (or once up front for threads)."""
+    global _resolver, _session, _cache_db, _cache_ttl_seconds, _cache_refresh
+    _resolver = _load_resolver(resolver_path)
+    _session = _resolver.HttpSession()
+    _cache_db = cache_db
+    _cache_ttl_seconds = cache_ttl_days * 86400
+    _cache_refresh = refresh
+
+def init_cache(cache_db: str) -> bool:
+    """
+    Create the lookup cache database if needed and switch it to WAL mode.
+    Returns False, after warning on stderr, if the cache cannot be used.
+    """
+    try:
+        with closing(sqlite3.connect(cache_db)) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS cache ('
+                         'artifact TEXT PRIMARY KEY, repository_url TEXT NOT NULL, ts REAL NOT NULL)')
+            conn.commit()
+    except sqlite3.Error as e:
+        print(f"Warning: lookup cache {cache_db} unavailable ({e}); continuing without it", file=sys.stderr)
+        return False
+    return True
+
+def _cache_connection() -> sqlite3.Connection:
+    """Return this thread's cache connection, opening it on first use."""
+    conn = getattr(_cache_local, 'conn', None)
+    if conn is None:
+        conn = _cache_local.conn = sqlite3.connect(_cache_db, timeout=30)
+    return conn
+
+def cache_lookup(artifact: str) -> Optional[str]:
+    """Return the cached repository URL for an artifact if present and not expired."""
+    try:
+        row = _cache_connection().execute(
+            'SELECT repository_url FROM cache WHERE artifact = ? AND ts > ?',
+            (artifact, time.time() - _cache_ttl_seconds)
+        ).fetchone()
+    except sqlite3.Error:
+        return None  # The cache is best effort; fall back to resolving
+    return row[0] if row else None
+
+def cache_store(artifact: str, repository_url: str):
+    """Record a successful resolution in the cache."""
+    try:
+        with _cache_connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO cache (artifact, repository_url, ts) VALUES (?, ?, ?)',
+                         (artifact, repository_url, time.time()))
+    except sqlite3.Error:
+        pass
 
-def resolve_artifact(artifact: str, resolver_script: str = "./get-repo-url.py") -> Dict[str, Any]:
+def resolve_artifact(artifact: str) -> Dict[str, Any]:
     """Resolve a single artifact and return results."""
     parts = artifact.split(':')
     if len(parts) != 2:
@@ -32,115 +103,147 @@ def resolve_artifact(artifact: str, resolver_script: str = "./get-repo-url.py")
 
     group_id, artifact_id = parts
 
-    start_time = time.time()
-    try:
-        result = subprocess.run(
-            [sys.executable, resolver_script, artifact],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        elapsed_ms = int((time.time() - start_time) * 1000)
-
-        if result.returncode == 0:
+    if _cache_db and not _cache_refresh:
+        repository_url = cache_lookup(artifact)
+        if repository_url:
             return {
                 'artifact': artifact,
                 'group_id': group_id,
                 'artifact_id': artifact_id,
                 'resolved': True,
-                'repository_url': result.stdout.strip(),
+                'repository_url': repository_url,
                 'error': None,
-                'response_time_ms': elapsed_ms
+                'response_time_ms': 0
             }
-        else:
-            error_msg = result.stderr.strip() if result.stderr else 'Repository URL not found'
-            return {
-                'artifact': artifact,
-                'group_id': group_id,
-                'artifact_id': artifact_id,
-                'resolved': False,
-                'repository_url': '',
-                'error': error_msg,
-                'response_time_ms': elapsed_ms
-            }
-    except subprocess.TimeoutExpired:
+
+    start_time = time.perf_counter()
+    try:
+        repository_url = _resolver.resolve(artifact, session=_session)
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        if _cache_db:
+            cache_store(artifact, repository_url)
         return {
             'artifact': artifact,
             'group_id': group_id,
             'artifact_id': artifact_id,
-            'resolved': False,
-            'repository_url': '',
-            'error': 'Resolution timeout (30s)',
-            'response_time_ms': 30000
+            'resolved': True,
+            'repository_url': repository_url,
+            'error': None,
+            'response_time_ms': elapsed_ms
         }
     except Exception as e:
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
         return {
             'artifact': artifact,
             'group_id': group_id,
             'artifact_id': artifact_id,
             'resolved': False,
             'repository_url': '',
-            'error': str(e),
-            'response_time_ms': 0
+            'error': str(e) or 'Repository URL not found',
+            'response_time_ms': elapsed_ms
         }
 
 def read_artifacts(file_path: str) -> List[str]:
     """Read artifacts from input file, skipping comments and empty lines."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    # Scan bytes so comment and blank lines are never decoded
     artifacts = []
-    with open(file_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                artifacts.append(line)
+    for line in data.splitlines():
+        line = line.strip()
+        if line and not line.startswith(b'#'):
+            artifacts.append(line.decode('utf-8'))
     return artifacts
 
-def resolve_parallel(artifacts: List[str], resolver_script: str, max_workers: int) -> List[Dict[str, Any]]:
-    """Resolve artifacts in parallel."""
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_artifact = {
-            executor.submit(resolve_artifact, artifact, resolver_script): artifact
-            for artifact in artifacts
+def resolve_parallel(artifacts: List[str], resolver_path: str, max_workers: int,
+                     executor_type: str = 'process', cache_db: Optional[str] = None,
+                     cache_ttl_days: int = 30, refresh: bool = False,
+                     ordered: bool = False, show_progress: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Resolve artifacts in parallel using a thread or process pool.
+
+    Results are yielded as workers complete them. With ordered=True they are
+    yielded in input order instead, each as soon as every earlier artifact
+    has been resolved.
+    """
+    if cache_db and not init_cache(cache_db):
+        cache_db = None
+
+    worker_args = (resolver_path, cache_db, cache_ttl_days, refresh)
+    if executor_type == 'thread':
+        _init_worker(*worker_args)
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                      initializer=_init_worker,
+                                                      initargs=worker_args)
+
+    completed = 0
+    resolved_count = 0
+    pending = {}  # input index -> result waiting on earlier artifacts
+    next_index = 0
+    last_progress = 0.0
+    with pool as executor:
+        future_to_index = {
+            executor.submit(resolve_artifact, artifact): i
+            for i, artifact in enumerate(artifacts)
         }
 
-        for future in concurrent.futures.as_completed(future_to_artifact):
+        for future in concurrent.futures.as_completed(future_to_index):
             result = future.result()
-            results.append(result)
-
-            # Show progress if stderr is a terminal
-            if sys.stderr.isatty():
-                resolved_count = sum(1 for r in results if r['resolved'])
-                sys.stderr.write(f"\rProcessing: {len(results)}/{len(artifacts)} "
+            completed += 1
+            resolved_count += result['resolved']
+
+            # Throttle progress to ~20 updates/sec; fast workers would otherwise flood stderr
+            now = time.monotonic()
+            if show_progress and (now - last_progress >= 0.05 or completed == len(artifacts)):
+                last_progress = now
+                sys.stderr.write(f"\rProcessing: {completed}/{len(artifacts)} "
                                  f"(Resolved: {resolved_count})  ")
                 sys.stderr.flush()
 
-    if sys.stderr.isatty():
+            if not ordered:
+                yield result
+                continue
+
+            pending[future_to_index[future]] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+
+    if show_progress:
         sys.stderr.write("\r" + " " * 50 + "\r")  # Clear progress line
         sys.stderr.flush()
 
-    # Sort results to maintain input order
-    artifact_order = {a: i for i, a in enumerate(artifacts)}
-    results.sort(key=lambda r: artifact_order.get(r['artifact'], float('inf')))
+def build_summary(total: int, resolved: int, total_ms: int) -> Dict[str, Any]:
+    """Build the summary block from running totals."""
+    return {
+        'total': total,
+        'resolved': resolved,
+        'unresolved': total - resolved,
+        'resolution_rate': round(resolved * 100 / total, 2) if total else 0,
+        'avg_response_time_ms': round(total_ms / total, 2) if total else 0
+    }
 
-    return results
+def utc_timestamp() -> str:
+    """Return the current UTC time as an ISO 8601 string with a Z suffix."""
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
 
-def output_json(results: List[Dict], input_file: str, output_file: Optional[str] = None):
+def output_json(results: Iterable[Dict], input_file: str, output_file: Optional[str] = None,
+                timestamp: Optional[str] = None):
     """Output results in JSON format."""
+    results = list(results)
+    resolved = total_ms = 0
+    for r in results:
+        resolved += r['resolved']
+        total_ms += r['response_time_ms']
+
     output = {
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'timestamp': timestamp or utc_timestamp(),
         'input_file': input_file,
         'artifacts': results,
-        'summary': {
-            'total': len(results),
-            'resolved': sum(1 for r in results if r['resolved']),
-            'unresolved': sum(1 for r in results if not r['resolved']),
-            'resolution_rate': round(
-                sum(1 for r in results if r['resolved']) * 100 / len(results), 2
-            ) if results else 0,
-            'avg_response_time_ms': round(
-                sum(r['response_time_ms'] for r in results) / len(results), 2
-            ) if results else 0
-        }
+        'summary': build_summary(len(results), resolved, total_ms)
     }
 
     json_str = json.dumps(output, indent=2)
@@ -150,7 +253,25 @@ def output_json(results: List[Dict], input_file: str, output_file: Optional[str]
     else:
         print(json_str)
 
-def output_csv(results: List[Dict], output_file: Optional[str] = None):
+def output_ndjson(results: Iterable[Dict], output_file: Optional[str] = None):
+    """Output one JSON object per result as it completes, followed by a summary line."""
+    total = resolved = total_ms = 0
+
+    f = open(output_file, 'w') if output_file else sys.stdout
+    try:
+        for r in results:
+            total += 1
+            resolved += r['resolved']
+            total_ms += r['response_time_ms']
+            f.write(json.dumps(r) + "\n")
+
+        summary = build_summary(total, resolved, total_ms)
+        f.write(json.dumps({'summary': summary}) + "\n")
+    finally:
+        if output_file:
+            f.close()
+
+def output_csv(results: Iterable[Dict], output_file: Optional[str] = None):
     """Output results in CSV format."""
     fieldnames = ['artifact', 'group_id', 'artifact_id', 'resolved',
                   'repository_url', 'error', 'response_time_ms']
@@ -165,59 +286,72 @@ def output_csv(results: List[Dict], output_file: Optional[str] = None):
         writer.writeheader()
         writer.writerows(results)
 
-def output_markdown(results: List[Dict], input_file: str):
+def _non_empty(results: Iterable[Dict]) -> Optional[Iterator[Dict]]:
+    """Return an iterator over results, or None (after telling the user) if there are none."""
+    results = iter(results)
+    first = next(results, None)
+    if first is None:
+        sys.stderr.write("No artifacts to report\n")
+        return None
+    return itertools.chain((first,), results)
+
+def output_markdown(results: Iterable[Dict], input_file: str, timestamp: Optional[str] = None):
     """Output results in Markdown format."""
+    results = _non_empty(results)
+    if results is None:
+        return
+
     print("# Maven Artifact Repository URLs")
     print(f"\n**Input File:** `{input_file}`")
-    print(f"**Timestamp:** {datetime.utcnow().isoformat()}Z")
+    print(f"**Timestamp:** {timestamp or utc_timestamp()}")
     print("\n| Artifact | Status | Repository URL | Response Time |")
     print("|----------|--------|----------------|---------------|")
 
+    total = resolved = 0
     for r in results:
+        total += 1
+        resolved += r['resolved']
         status = "✅" if r['resolved'] else "❌"
         url = r['repository_url'] or (r.get('error', 'Not found'))
         print(f"| {r['artifact']} | {status} | {url} | {r['response_time_ms']}ms |")
 
-    total = len(results)
-    resolved = sum(1 for r in results if r['resolved'])
     print(f"\n**Summary:** {resolved}/{total} resolved "
-          f"({resolved*100//total if total else 0}%)")
+          f"({resolved*100//total}%)")
 
-def output_table(results: List[Dict]):
+def output_table(results: Iterable[Dict]):
     """Output results in table format with colors."""
-    # ANSI color codes
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    RESET = '\033[0m'
-
-    # Disable colors if not a terminal
-    if not sys.stdout.isatty():
-        GREEN = RED = RESET = ''
+    results = _non_empty(results)
+    if results is None:
+        return
+
+    # Row templates are built once; colors are only baked in when stdout is a terminal
+    row_fmt = "{}{{:<60}} {:<10} {{:<50}} {{:<10}}{}\n"
+    if sys.stdout.isatty():
+        ok_fmt = row_fmt.format('\033[92m', "✓", '\033[0m')
+        fail_fmt = row_fmt.format('\033[91m', "✗", '\033[0m')
+    else:
+        ok_fmt = row_fmt.format('', "✓", '')
+        fail_fmt = row_fmt.format('', "✗", '')
 
     print(f"{'ARTIFACT':<60} {'STATUS':<10} {'REPOSITORY URL':<50} {'TIME(ms)':<10}")
     print("-" * 130)
 
+    write = sys.stdout.write
+    total = resolved = 0
     for r in results:
+        total += 1
         if r['resolved']:
-            color = GREEN
-            status = "✓"
-            url = r['repository_url']
+            resolved += 1
+            write(ok_fmt.format(r['artifact'], r['repository_url'], r['response_time_ms']))
         else:
-            color = RED
-            status = "✗"
-            url = r.get('error', 'Not found')
+            write(fail_fmt.format(r['artifact'], r.get('error', 'Not found'), r['response_time_ms']))
 
-        print(f"{color}{r['artifact']:<60} {status:<10} {url:<50} "
-              f"{r['response_time_ms']:<10}{RESET}")
-
-    total = len(results)
-    resolved = sum(1 for r in results if r['resolved'])
     unresolved = total - resolved
 
     print("-" * 130)
     print(f"Summary: Total: {total} | Resolved: {resolved} | "
           f"Unresolved: {unresolved} | Resolution Rate: "
-          f"{resolved*100//total if total else 0}%")
+          f"{resolved*100//total}%")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -226,19 +360,35 @@ def main():
     parser.add_argument('input_file', nargs='?', default='artifacts.txt',
                         help='File containing artifacts (one per line)')
     parser.add_argument('-f', '--format',
-                        choices=['json', 'csv', 'markdown', 'table'],
+                        choices=['json', 'ndjson', 'csv', 'markdown', 'table'],
                         default='json',
-                        help='Output format (default: json)')
+                        help='Output format; all but json stream results as they '
+                             'complete (default: json)')
     parser.add_argument('-o', '--output',
                         help='Output file (stdout if not specified)')
     parser.add_argument('-r', '--resolver', default='./get-repo-url.py',
                         help='Path to get-repo-url.py resolver script')
     parser.add_argument('-p', '--parallel', type=int, default=4,
                         help='Number of parallel workers (default: 4)')
+    parser.add_argument('-e', '--executor', choices=['thread', 'process'],
+                        default='process',
+                        help='Worker pool type; process pools run resolver parsing '
+                             'outside the GIL (default: process)')
+    parser.add_argument('--cache-db', default='.saa-lookup-cache.sqlite',
+                        help='SQLite cache of resolved artifacts, empty to disable '
+                             '(default: .saa-lookup-cache.sqlite)')
+    parser.add_argument('--cache-ttl-days', type=int, default=30,
+                        help='Days before a cached resolution expires (default: 30)')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore cached resolutions but still update the cache')
+    parser.add_argument('--sorted', action='store_true',
+                        help='Stream results in input order rather than completion order '
+                             '(json output is always in input order)')
     parser.add_argument('-q', '--quiet', action='store_true',
                         help='Suppress progress output')
 
     args = parser.parse_args()
+    run_timestamp = utc_timestamp()
 
     # Validate input file
     if not Path(args.input_file).exists():
@@ -253,27 +403,34 @@ def main():
     # Read artifacts from input file
     artifacts = read_artifacts(args.input_file)
 
+    # Resolve artifacts; an empty list still goes through the writers below so
+    # every format handles it the same way
     if not artifacts:
         print("Warning: No artifacts found in input file", file=sys.stderr)
-        # Output empty result
-        if args.format == 'json':
-            output_json([], args.input_file, args.output)
-        sys.exit(0)
-
-    # Resolve artifacts
-    if not args.quiet:
-        print(f"Resolving {len(artifacts)} artifacts using "
-              f"{args.parallel} workers...", file=sys.stderr)
-
-    results = resolve_parallel(artifacts, args.resolver, args.parallel)
+        results = []
+    else:
+        if not args.quiet:
+            print(f"Resolving {len(artifacts)} artifacts using "
+                  f"{args.parallel} {args.executor} workers...", file=sys.stderr)
+
+        # Streamed rows written to the same terminal would be garbled by the progress line
+        streams_to_terminal = (args.format != 'json' and not args.output
+                               and sys.stdout.isatty())
+        results = resolve_parallel(artifacts, args.resolver, args.parallel, args.executor,
+                                   args.cache_db, args.cache_ttl_days, args.refresh,
+                                   # json is written as a whole, so streaming order buys nothing there
+                                   ordered=args.sorted or args.format == 'json',
+                                   show_progress=sys.stderr.isatty() and not streams_to_terminal)
 
     # Output results in requested format
     if args.format == 'json':
-        output_json(results, args.input_file, args.output)
+        output_json(results, args.input_file, args.output, run_timestamp)
+    elif args.format == 'ndjson':
+        output_ndjson(results, args.output)
     elif args.format == 'csv':
         output_csv(results, args.output)
     elif args.format == 'markdown':
-        output_markdown(results, args.input_file)
+        output_markdown(results, args.input_file, run_timestamp)
     else:  # table
         output_table(results)
 
@@ -2,18 +2,194 @@
 """
 Script to trigger GitHub workflows based on resolved artifacts from artifact-details.json
 """
+import argparse
+import concurrent.futures
+import http.client
 import json
 import os
 import subprocess
 import sys
+import textwrap
+import threading
 import time
+import urllib.parse
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson  # optional, faster parser for large artifact-details.json files
+except ImportError:
+    orjson = None
+
+GITHUB_API_HOST = "api.github.com"
+
+# gh CLI command templates shared by stdout and the GitHub step summary
+WORKFLOW_CMD_TMPL = ('gh workflow run {workflow} --repo {repo} --ref {ref} '
+                     '--field slug="{slug}" --field repo_url="{repo_url}" '
+                     '--field coordinates="{coordinates}"')
+MANUAL_CMD_TMPL = ('gh workflow run {workflow} \\\n'
+                   '  --repo {repo} \\\n'
+                   '  --ref {ref} \\\n'
+                   '  --field slug="{slug}" \\\n'
+                   '  --field repo_url="<REPLACE_WITH_REPOSITORY_URL>" \\\n'
+                   '  --field coordinates="{coordinates}"')
+
+# Shown in place of artifact fields that are missing or null
+NOT_AVAILABLE = "N/A"
+
+# Per-artifact blocks of the stdout summary
+ARTIFACT_INFO_TMPL = ("  • {coordinates}\n"
+                      "    Repository: {repository_url}\n"
+                      "    Error: {error}")
+TRIGGERED_INFO_TMPL = ("\n  {coordinates}\n"
+                       "    • Repository: {repository_url}\n"
+                       "    • Slug: {artifact_id}\n"
+                       "    • Coordinates: {coordinates}")
+
+def display(value: Optional[str]) -> str:
+    """Render an artifact field for output, showing N/A when it is missing."""
+    return NOT_AVAILABLE if value is None else value
+
+@dataclass(slots=True)
+class Artifact:
+    """One entry of artifact-details.json, parsed once at load time; missing fields are None."""
+    artifact_id: Optional[str]
+    repository_url: Optional[str]
+    coordinates: Optional[str]
+    resolved: bool
+    error: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> "Artifact":
+        return cls(artifact_id=record.get("artifact_id"),
+                   repository_url=record.get("repository_url"),
+                   coordinates=record.get("artifact"),
+                   resolved=record.get("resolved") is True,
+                   error=record.get("error"))
+
+    def display_fields(self) -> Dict[str, str]:
+        """Return the text fields formatted for output, keyed by template placeholder."""
+        return {
+            "artifact_id": display(self.artifact_id),
+            "repository_url": display(self.repository_url),
+            "coordinates": display(self.coordinates),
+            "error": display(self.error),
+        }
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until the caller may proceed."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve a token even if that leaves the bucket in debt; the debt is our wait
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+def get_github_token() -> str:
+    """Return a GitHub token from GH_TOKEN/GITHUB_TOKEN, falling back to `gh auth token`."""
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+
+    # Only the token on stdout matters; gh's stderr is discarded rather than captured
+    try:
+        proc = subprocess.run(["gh", "auth", "token"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return ""
+    if proc.returncode != 0:
+        return ""
+    return proc.stdout.decode("utf-8", "replace").strip()
+
+class GhClient:
+    """
+    Minimal GitHub REST client for workflow dispatches.
+
+    The token is read once up front, and each thread keeps a single keep-alive
+    HTTPS connection to the API that is reused for every dispatch.
+    """
+
+    def __init__(self, token: str, host: str = GITHUB_API_HOST, timeout: int = 30):
+        self.host = host
+        self.timeout = timeout
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "Content-Type": "application/json",
+            "User-Agent": "saa-workflows",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        self._local = threading.local()
+
+    @classmethod
+    def from_environment(cls) -> Optional["GhClient"]:
+        """Build a client from GH_TOKEN/GITHUB_TOKEN or `gh auth token`, or None without a token."""
+        token = get_github_token()
+        return cls(token) if token else None
+
+    @staticmethod
+    def dispatch_path(target_repo: str, workflow_file: str) -> str:
+        """Return the REST path of the workflow_dispatch endpoint."""
+        return (f"/repos/{target_repo}/actions/workflows/"
+                f"{urllib.parse.quote(workflow_file, safe='')}/dispatches")
+
+    def _post(self, path: str, body: str) -> Tuple[int, str]:
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            if connection is None:
+                connection = self._local.connection = http.client.HTTPSConnection(self.host, timeout=self.timeout)
+            try:
+                connection.request("POST", path, body=body, headers=self.headers)
+                response = connection.getresponse()
+                return response.status, response.read().decode("utf-8", "replace")
+            except (http.client.HTTPException, OSError) as e:
+                # Any failure can leave the connection mid-request; never reuse it
+                connection.close()
+                self._local.connection = None
+                # Only a dropped idle keep-alive connection is retried; after a
+                # timeout the dispatch may already have been accepted
+                stale = isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+                if attempt or not stale:
+                    raise
+
+    def dispatch_workflow(self, target_repo: str, workflow_file: str, ref: str,
+                          inputs: Dict[str, str]) -> Tuple[bool, str]:
+        """
+        Trigger a workflow_dispatch event.
+
+        Returns:
+            Tuple of (success, error message; empty on success)
+        """
+        status, body = self._post(self.dispatch_path(target_repo, workflow_file),
+                                  json.dumps({"ref": ref, "inputs": inputs}))
+        if status == 204:
+            return True, ""
+
+        # Errors such as 403 (permissions/rate limit) and 422 (bad inputs or ref) carry a JSON message
+        try:
+            message = json.loads(body).get("message") or body
+        except (ValueError, AttributeError):
+            message = body
+        return False, f"HTTP {status}: {message}"
+
 def load_artifact_details(filepath: str = "artifact-details.json") -> Dict:
-    """Load and parse the artifact details JSON file."""
+    """Load and parse the artifact details JSON file, using orjson when it is installed."""
     try:
+        if orjson is not None:
+            return orjson.loads(Path(filepath).read_bytes())
         with open(filepath, 'r') as f:
             return json.load(f)
     except FileNotFoundError:
@@ -23,48 +199,80 @@ def load_artifact_details(filepath: str = "artifact-details.json") -> Dict:
         print(f"Error parsing JSON: {e}")
         sys.exit(1)
 
-def filter_resolved_artifacts(data: Dict) -> Tuple[List[Dict], List[Dict]]:
+def iter_artifacts(filepath: str = "artifact-details.json") -> Iterator[Artifact]:
     """
-    Separate artifacts into resolved and unresolved lists.
-
-    Returns:
-        Tuple of (resolved_artifacts, unresolved_artifacts)
+    Yield artifacts from artifact-details.json, or stream them line by line
+    from an .ndjson file (bulk-repo-lookup.py -f ndjson) without loading it whole.
     """
-    resolved = []
-    unresolved = []
+    if not filepath.endswith(".ndjson"):
+        for record in load_artifact_details(filepath).get("artifacts", []):
+            yield Artifact.from_dict(record)
+        return
 
-    for artifact in data.get("artifacts", []):
-        if artifact.get("resolved") is True:
-            resolved.append(artifact)
-        else:
-            unresolved.append(artifact)
+    loads = orjson.loads if orjson is not None else json.loads
+    try:
+        with open(filepath, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = loads(line)
+                # The trailing summary record is not an artifact
+                if "summary" not in record:
+                    yield Artifact.from_dict(record)
+    except FileNotFoundError:
+        print(f"Error: {filepath} not found")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error parsing JSON: {e}")
+        sys.exit(1)
 
-    return resolved, unresolved
+# Hosts whose repository paths are case-insensitive
+CASE_INSENSITIVE_HOSTS = frozenset({"github.com", "gitlab.com", "bitbucket.org"})
 
-def get_unique_repositories(artifacts: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+def _norm_repo_key(repo_url: str) -> Tuple[str, str, str]:
+    """
+    Key a repository URL by host, path and query, ignoring the scheme, host case
+    and trailing slashes. Paths are case-folded only on case-insensitive hosts.
+    The query is kept so gitweb URLs (...asf?p=camel) stay distinct.
+    """
+    parts = urllib.parse.urlparse(repo_url)
+    host = parts.netloc.lower()
+    path = parts.path.rstrip("/")
+    if host in CASE_INSENSITIVE_HOSTS:
+        path = path.lower()
+    return host, path, parts.query
+
+def partition_artifacts(artifacts: Iterable[Artifact]) -> Tuple[List[Artifact], List[Tuple[Artifact, Artifact]],
+                                                                List[Artifact], int]:
     """
-    Filter artifacts to unique repository URLs.
-    If multiple artifacts share the same repository_url, keep only the first.
+    Classify artifacts in a single pass. Resolved artifacts are kept only for
+    the first occurrence of each repository; later ones, including case and
+    trailing-slash variants of the same URL, are duplicates.
 
     Returns:
-        Tuple of (unique_artifacts, duplicate_artifacts)
+        Tuple of (unique_artifacts, duplicate_artifacts, unresolved_artifacts, resolved_count),
+        where duplicate_artifacts holds (duplicate, kept artifact) pairs
     """
-    seen_urls: Set[str] = set()
-    unique_artifacts: List[Dict] = []
-    duplicate_artifacts: List[Dict] = []
+    seen: Dict[Tuple[str, str, str], Artifact] = {}
+    duplicate_artifacts: List[Tuple[Artifact, Artifact]] = []
+    unresolved: List[Artifact] = []
+    resolved_count = 0
 
     for artifact in artifacts:
-        repo_url = artifact.get("repository_url", "")
-        if repo_url:
-            if repo_url not in seen_urls:
-                seen_urls.add(repo_url)
-                unique_artifacts.append(artifact)
-            else:
-                duplicate_artifacts.append(artifact)
-
-    return unique_artifacts, duplicate_artifacts
-
-def build_workflow_command(artifact: Dict, target_repo: str = "org/repo",
+        if not artifact.resolved:
+            unresolved.append(artifact)
+            continue
+        resolved_count += 1
+        repo_url = artifact.repository_url
+        if not repo_url:
+            continue
+        kept = seen.setdefault(_norm_repo_key(repo_url), artifact)
+        if kept is not artifact:
+            duplicate_artifacts.append((artifact, kept))
+
+    return list(seen.values()), duplicate_artifacts, unresolved, resolved_count
+
+def build_workflow_command(artifact: Artifact, target_repo: str = "org/repo",
                            workflow_file: str = "generate-mapping-workflow.yml",
                            ref: str = "main") -> str:
     """
@@ -73,26 +281,27 @@ def build_workflow_command(artifact: Dict, target_repo: str = "org/repo",
     Returns:
         The full gh CLI command as a string
     """
-    slug = artifact.get("artifact_id", "")
-    repo_url = artifact.get("repository_url", "")
-    coordinates = artifact.get("artifact", "")
-
-    # Build the command as a string for display
-    cmd = (f"gh workflow run {workflow_file} "
-           f"--repo {target_repo} "
-           f"--ref {ref} "
-           f"--field slug=\"{slug}\" "
-           f"--field repo_url=\"{repo_url}\" "
-           f"--field coordinates=\"{coordinates}\"")
+    return WORKFLOW_CMD_TMPL.format(workflow=workflow_file, repo=target_repo, ref=ref,
+                                    slug=artifact.artifact_id or "",
+                                    repo_url=artifact.repository_url or "",
+                                    coordinates=artifact.coordinates or "")
 
-    return cmd
+def build_manual_command(artifact: Artifact, target_repo: str, workflow_file: str, ref: str) -> str:
+    """
+    Build the multi-line gh CLI command for an unresolved artifact, with a
+    placeholder for the repository URL.
+    """
+    return MANUAL_CMD_TMPL.format(workflow=workflow_file, repo=target_repo, ref=ref,
+                                  slug=display(artifact.artifact_id),
+                                  coordinates=display(artifact.coordinates))
 
-def trigger_workflow(artifact: Dict, target_repo: str = "org/repo",
+def trigger_workflow(artifact: Artifact, target_repo: str = "org/repo",
                      workflow_file: str = "generate-mapping-workflow.yml",
                      ref: str = "main", dry_run: bool = False,
-                     delay_seconds: int = 0) -> Tuple[bool, str]:
+                     rate_limiter: Optional[TokenBucket] = None,
+                     client: Optional[GhClient] = None) -> Tuple[bool, str]:
     """
-    Trigger a GitHub workflow using gh CLI.
+    Trigger a GitHub workflow through the REST API.
 
     Args:
         artifact: The artifact data containing the required fields
@@ -100,73 +309,85 @@ def trigger_workflow(artifact: Dict, target_repo: str = "org/repo",
         workflow_file: The workflow file name
         ref: The branch/tag/SHA to run the workflow from
         dry_run: If True, print the command instead of executing
-        delay_seconds: Seconds to wait after triggering (for rate limiting)
+        rate_limiter: Token bucket to acquire from before dispatching (for rate limiting)
+        client: GitHub API client used to dispatch (required unless dry_run)
 
     Returns:
         Tuple of (success: bool, command: str)
     """
     # Prepare the workflow inputs
-    slug = artifact.get("artifact_id", "")
-    repo_url = artifact.get("repository_url", "")
-    coordinates = artifact.get("artifact", "")
-
-    # Build the gh workflow run command
-    cmd = [
-        "gh", "workflow", "run",
-        workflow_file,
-        "--repo", target_repo,
-        "--ref", ref,
-        "--field", f"slug={slug}",
-        "--field", f"repo_url={repo_url}",
-        "--field", f"coordinates={coordinates}"
-    ]
+    slug = artifact.artifact_id or ""
+    repo_url = artifact.repository_url or ""
+    coordinates = artifact.coordinates or ""
 
-    # Build command string for display/logging
+    # Equivalent gh CLI command for display/logging
     command_str = build_workflow_command(artifact, target_repo, workflow_file, ref)
 
     if dry_run:
-        print(f"[DRY RUN] Would execute: {command_str}")
-        if delay_seconds > 0:
-            print(f"[DRY RUN] Would wait {delay_seconds} second(s) after trigger")
+        print(f"[DRY RUN] Would execute: {command_str}\n"
+              f"[DRY RUN]   (POST https://{GITHUB_API_HOST}{GhClient.dispatch_path(target_repo, workflow_file)})",
+              flush=True)
         return True, command_str
 
     try:
-        print(f"Triggering workflow for artifact: {coordinates}")
-        print(f"  Repository: {repo_url}")
-        print(f"  Slug: {slug}")
-
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        print(f"✓ Successfully triggered workflow for {coordinates}")
-
-        # Apply rate limit delay if specified
-        if delay_seconds > 0:
-            print(f"  Waiting {delay_seconds} second(s) before next trigger (rate limit protection)...")
-            time.sleep(delay_seconds)
-
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        # One print per block so concurrent triggers don't interleave lines
+        print(f"Triggering workflow for artifact: {coordinates}\n"
+              f"  Repository: {repo_url}\n"
+              f"  Slug: {slug}", flush=True)
+
+        success, error = client.dispatch_workflow(target_repo, workflow_file, ref, {
+            "slug": slug,
+            "repo_url": repo_url,
+            "coordinates": coordinates
+        })
+        if not success:
+            print(f"✗ Failed to trigger workflow for {coordinates}\n"
+                  f"  Error: {error}", flush=True)
+            return False, command_str
+
+        print(f"✓ Successfully triggered workflow for {coordinates}", flush=True)
         return True, command_str
 
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Failed to trigger workflow for {coordinates}")
-        print(f"  Error: {e.stderr}")
+    except (http.client.HTTPException, OSError) as e:
+        print(f"✗ Failed to trigger workflow for {coordinates}\n"
+              f"  Error: {e}", flush=True)
         return False, command_str
 
+def record_trigger_result(processing_results: Dict, artifact: Artifact, success: bool, command: str):
+    """Add the outcome of one workflow trigger to the processing results."""
+    if success:
+        processing_results["workflows_triggered"] += 1
+        processing_results["triggered_artifacts"].append(artifact)
+        processing_results["workflow_commands"].append({
+            "artifact": artifact,
+            "command": command
+        })
+    else:
+        processing_results["workflows_failed"] += 1
+        processing_results["failed_artifacts"].append(artifact)
+        processing_results["failed_commands"].append({
+            "artifact": artifact,
+            "command": command
+        })
+
+def format_summary_section(title: str, char: str = "=") -> str:
+    """Format a section header."""
+    width = 80
+    return f"\n{char * width}\n {title}\n{char * width}"
+
 def print_summary_section(title: str, char: str = "="):
     """Print a formatted section header."""
-    width = 80
-    print("\n" + char * width)
-    print(f" {title}")
-    print(char * width)
+    print(format_summary_section(title, char))
 
-def format_artifact_info(artifact: Dict) -> str:
+def format_artifact_info(artifact: Artifact) -> str:
     """Format artifact information for display."""
-    return (f"  • {artifact.get('artifact', 'N/A')}\n"
-            f"    Repository: {artifact.get('repository_url', 'N/A')}\n"
-            f"    Error: {artifact.get('error', 'N/A')}")
+    return ARTIFACT_INFO_TMPL.format_map(artifact.display_fields())
 
 def main():
     """Main execution function."""
-    import argparse
-
     parser = argparse.ArgumentParser(description="Trigger workflows for resolved artifacts")
     parser.add_argument("--file", default="artifact-details.json",
                         help="Path to artifact-details.json (default: artifact-details.json)")
@@ -178,6 +399,10 @@ def main():
                         help="Git ref to run workflow from (default: main)")
     parser.add_argument("--delay", type=int, default=5,
                         help="Seconds to wait between workflow triggers to avoid rate limits (default: 5, use 0 to disable)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Number of concurrent workflow triggers (default: 8)")
+    parser.add_argument("--serial", action="store_true",
+                        help="Trigger workflows one at a time (same as --workers 1)")
     parser.add_argument("--dry-run", action="store_true",
                         help="Print commands without executing them")
 
@@ -205,35 +430,34 @@ def main():
         }
     }
 
-    # Load the artifact details
-    print(f"Loading artifact details from {args.file}...")
-    data = load_artifact_details(args.file)
-
-    # Get total count
-    all_artifacts = data.get("artifacts", [])
-    processing_results["total_artifacts"] = len(all_artifacts)
+    # Load and classify the artifact details in one pass
+    print(f"Loading artifact details from {args.file}...", flush=True)
+    unique_artifacts, duplicate_artifacts, unresolved_artifacts, resolved_count = \
+        partition_artifacts(iter_artifacts(args.file))
 
-    # Separate resolved and unresolved artifacts
-    resolved_artifacts, unresolved_artifacts = filter_resolved_artifacts(data)
-    processing_results["resolved_count"] = len(resolved_artifacts)
+    processing_results["total_artifacts"] = resolved_count + len(unresolved_artifacts)
+    processing_results["resolved_count"] = resolved_count
     processing_results["unresolved_count"] = len(unresolved_artifacts)
     processing_results["unresolved_artifacts"] = unresolved_artifacts
-
-    print(f"Found {len(resolved_artifacts)} resolved artifacts")
-    print(f"Found {len(unresolved_artifacts)} unresolved artifacts")
-
-    # Filter to unique repository URLs
-    unique_artifacts, duplicate_artifacts = get_unique_repositories(resolved_artifacts)
     processing_results["unique_repos"] = len(unique_artifacts)
     processing_results["duplicate_repos"] = len(duplicate_artifacts)
     processing_results["duplicate_artifacts"] = duplicate_artifacts
 
+    print(f"Found {resolved_count} resolved artifacts")
+    print(f"Found {len(unresolved_artifacts)} unresolved artifacts")
     print(f"Found {len(unique_artifacts)} unique repositories")
     if duplicate_artifacts:
         print(f"Skipping {len(duplicate_artifacts)} duplicate repository entries")
 
     # Trigger workflows if we have unique artifacts
     if unique_artifacts:
+        client = None
+        if not args.dry_run:
+            client = GhClient.from_environment()
+            if client is None:
+                print("Error: no GitHub token found; set GH_TOKEN or run `gh auth login`")
+                return 1
+
         print_summary_section("TRIGGERING WORKFLOWS", "=")
 
         if args.delay > 0 and len(unique_artifacts) > 1:
@@ -241,221 +465,213 @@ def main():
             print(f"Note: Will add {args.delay}s delay between triggers (total ~{total_delay}s)")
             print()
 
-        for i, artifact in enumerate(unique_artifacts):
-            # Don't delay after the last workflow
-            delay = args.delay if i < len(unique_artifacts) - 1 else 0
-
-            success, command = trigger_workflow(artifact, args.repo, args.workflow, args.ref,
-                                                args.dry_run, delay)
-
-            if success:
-                processing_results["workflows_triggered"] += 1
-                processing_results["triggered_artifacts"].append(artifact)
-                processing_results["workflow_commands"].append({
-                    "artifact": artifact,
-                    "command": command
-                })
-            else:
-                processing_results["workflows_failed"] += 1
-                processing_results["failed_artifacts"].append(artifact)
-                processing_results["failed_commands"].append({
-                    "artifact": artifact,
-                    "command": command
-                })
-            print("-" * 40)
-
-    # Print comprehensive summary
-    print_summary_section("PROCESSING SUMMARY", "╔")
+        # Pace dispatches at one per --delay seconds (or 10/s without a delay)
+        bucket = TokenBucket(rate=1 / args.delay if args.delay > 0 else 10)
+        workers = 1 if args.serial else args.workers
+
+        def dispatch(artifact: Artifact) -> Tuple[bool, str]:
+            # The separator is printed by the worker so it follows its own trigger output
+            outcome = trigger_workflow(artifact, args.repo, args.workflow, args.ref,
+                                       args.dry_run, bucket, client)
+            print("-" * 40, flush=True)
+            return outcome
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(dispatch, unique_artifacts))
+
+        # Record in input order so the summary is deterministic
+        for artifact, (success, command) in zip(unique_artifacts, outcomes):
+            record_trigger_result(processing_results, artifact, success, command)
+
+    # Build the summary once and write it in a single call
+    summary_lines: List[str] = []
+    p = summary_lines.append
+    p(format_summary_section("PROCESSING SUMMARY", "╔"))
 
     # Overall statistics
-    print("\n📊 OVERALL STATISTICS:")
-    print(f"  Total artifacts processed: {processing_results['total_artifacts']}")
-    print(f"  Resolved artifacts: {processing_results['resolved_count']}")
-    print(f"  Unresolved artifacts: {processing_results['unresolved_count']}")
-    print(f"  Unique repositories: {processing_results['unique_repos']}")
-    print(f"  Duplicate repositories skipped: {processing_results['duplicate_repos']}")
+    p("\n📊 OVERALL STATISTICS:")
+    p(f"  Total artifacts processed: {processing_results['total_artifacts']}")
+    p(f"  Resolved artifacts: {processing_results['resolved_count']}")
+    p(f"  Unresolved artifacts: {processing_results['unresolved_count']}")
+    p(f"  Unique repositories: {processing_results['unique_repos']}")
+    p(f"  Duplicate repositories skipped: {processing_results['duplicate_repos']}")
 
     # Workflow execution results
-    print("\n🚀 WORKFLOW EXECUTION:")
-    print(f"  Workflows triggered successfully: {processing_results['workflows_triggered']}")
-    print(f"  Workflows failed: {processing_results['workflows_failed']}")
+    p("\n🚀 WORKFLOW EXECUTION:")
+    p(f"  Workflows triggered successfully: {processing_results['workflows_triggered']}")
+    p(f"  Workflows failed: {processing_results['workflows_failed']}")
 
     # Detailed successful mappings
     if processing_results["triggered_artifacts"]:
-        print("\n✅ SUCCESSFULLY GENERATED MAPPINGS:")
+        p("\n✅ SUCCESSFULLY GENERATED MAPPINGS:")
         for artifact in processing_results["triggered_artifacts"]:
-            print(f"\n  {artifact.get('artifact', 'N/A')}")
-            print(f"    • Repository: {artifact.get('repository_url', 'N/A')}")
-            print(f"    • Slug: {artifact.get('artifact_id', 'N/A')}")
-            print(f"    • Coordinates: {artifact.get('artifact', 'N/A')}")
+            p(TRIGGERED_INFO_TMPL.format_map(artifact.display_fields()))
 
     # Failed workflows (if any)
     if processing_results["failed_artifacts"]:
-        print("\n❌ FAILED WORKFLOW TRIGGERS:")
+        p("\n❌ FAILED WORKFLOW TRIGGERS:")
         for artifact in processing_results["failed_artifacts"]:
-            print(format_artifact_info(artifact))
+            p(format_artifact_info(artifact))
 
     # Unresolved artifacts that need manual attention
     if processing_results["unresolved_artifacts"]:
-        print("\n⚠️  UNRESOLVED ARTIFACTS (REQUIRES MANUAL RESOLUTION):")
-        print(f"  Found {len(processing_results['unresolved_artifacts'])} artifacts that could not be resolved automatically:")
+        p("\n⚠️  UNRESOLVED ARTIFACTS (REQUIRES MANUAL RESOLUTION):")
+        p(f"  Found {len(processing_results['unresolved_artifacts'])} artifacts that could not be resolved automatically:")
         for artifact in processing_results["unresolved_artifacts"]:
-            print(f"\n{format_artifact_info(artifact)}")
+            p(f"\n{format_artifact_info(artifact)}")
 
         # Print manual resolution commands
-        print("\n📝 MANUAL RESOLUTION COMMANDS:")
-        print("  Once you've determined the repository URLs, use these commands:\n")
+        p("\n📝 MANUAL RESOLUTION COMMANDS:")
+        p("  Once you've determined the repository URLs, use these commands:\n")
         for artifact in processing_results["unresolved_artifacts"]:
-            artifact_coords = artifact.get('artifact', 'N/A')
-            artifact_slug = artifact.get('artifact_id', 'N/A')
-            print(f"  For {artifact_coords}:")
-            print(f"    gh workflow run {args.workflow} \\")
-            print(f"      --repo {args.repo} \\")
-            print(f"      --ref {args.ref} \\")
-            print(f"      --field slug=\"{artifact_slug}\" \\")
-            print(f"      --field repo_url=\"<REPLACE_WITH_REPOSITORY_URL>\" \\")
-            print(f"      --field coordinates=\"{artifact_coords}\"")
-            print()
+            p(f"  For {display(artifact.coordinates)}:")
+            p(textwrap.indent(build_manual_command(artifact, args.repo, args.workflow, args.ref), "    "))
+            p("")
 
     # Duplicate artifacts that were skipped
     if processing_results["duplicate_artifacts"]:
-        print("\n📋 SKIPPED DUPLICATE REPOSITORY ARTIFACTS:")
-        for artifact in processing_results["duplicate_artifacts"]:
-            print(f"  • {artifact.get('artifact', 'N/A')} (duplicate of {artifact.get('repository_url', 'N/A')})")
+        p("\n📋 SKIPPED DUPLICATE REPOSITORY ARTIFACTS:")
+        for artifact, kept in processing_results["duplicate_artifacts"]:
+            p(f"  • {display(artifact.coordinates)} (duplicate of {kept.repository_url})")
 
     # Final status
-    print_summary_section("FINAL STATUS", "╔")
+    p(format_summary_section("FINAL STATUS", "╔"))
 
     if processing_results["workflows_failed"] > 0:
-        print("❌ COMPLETED WITH ERRORS")
-        print(f"   {processing_results['workflows_failed']} workflow(s) failed to trigger")
+        p("❌ COMPLETED WITH ERRORS")
+        p(f"   {processing_results['workflows_failed']} workflow(s) failed to trigger")
         exit_code = 1
     elif processing_results["workflows_triggered"] == 0 and processing_results["unique_repos"] > 0:
-        print("⚠️  NO WORKFLOWS TRIGGERED")
-        print("   Check your configuration and permissions")
+        p("⚠️  NO WORKFLOWS TRIGGERED")
+        p("   Check your configuration and permissions")
         exit_code = 1
     elif processing_results["unresolved_count"] > 0:
-        print("⚠️  COMPLETED WITH WARNINGS")
-        print(f"   {processing_results['workflows_triggered']} workflow(s) triggered successfully")
-        print(f"   {processing_results['unresolved_count']} artifact(s) require manual resolution")
+        p("⚠️  COMPLETED WITH WARNINGS")
+        p(f"   {processing_results['workflows_triggered']} workflow(s) triggered successfully")
+        p(f"   {processing_results['unresolved_count']} artifact(s) require manual resolution")
         exit_code = 0
     else:
-        print("✅ COMPLETED SUCCESSFULLY")
-        print(f"   All {processing_results['workflows_triggered']} workflow(s) triggered successfully")
+        p("✅ COMPLETED SUCCESSFULLY")
+        p(f"   All {processing_results['workflows_triggered']} workflow(s) triggered successfully")
         exit_code = 0
 
+    p("\n" + "╔" * 80)
+    p(f"Execution completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    sys.stdout.write("\n".join(summary_lines) + "\n")
+    sys.stdout.flush()
+
     # GitHub Actions summary (if running in GitHub Actions)
     if os.environ.get('GITHUB_ACTIONS') == 'true' and os.environ.get('GITHUB_STEP_SUMMARY'):
         write_github_summary(processing_results)
 
-    print("\n" + "╔" * 80)
-    print(f"Execution completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
     return exit_code
 
 def write_github_summary(results: Dict):
     """Write a summary to GitHub Actions step summary."""
-    import os
-
     summary_file = os.environ.get('GITHUB_STEP_SUMMARY')
     if not summary_file:
         return
 
+    # Collect the summary and append it with a single write
+    parts: List[str] = []
+    p = parts.append
+
+    p("## 📊 Artifact Processing Summary\n\n")
+
+    # Statistics table
+    stats = [
+        ("Total Artifacts", results['total_artifacts']),
+        ("Resolved", results['resolved_count']),
+        ("Unresolved", results['unresolved_count']),
+        ("Unique Repositories", results['unique_repos']),
+        ("Workflows Triggered", results['workflows_triggered']),
+        ("Workflows Failed", results['workflows_failed']),
+    ]
+    p("### Overall Statistics\n")
+    p("| Metric | Count |\n")
+    p("|--------|-------|\n")
+    p("\n".join(f"| {metric} | {value} |" for metric, value in stats) + "\n\n")
+
+    # Workflow configuration
+    config = results.get('workflow_config', {})
+    settings = [
+        ("Target Repository", config.get('repo', 'N/A')),
+        ("Workflow File", config.get('workflow', 'N/A')),
+        ("Git Ref", config.get('ref', 'N/A')),
+    ]
+    p("### Workflow Configuration\n")
+    p("| Parameter | Value |\n")
+    p("|-----------|-------|\n")
+    p("\n".join(f"| {name} | `{value}` |" for name, value in settings) + "\n\n")
+
+    # Successfully triggered workflows with commands
+    if results.get('workflow_commands'):
+        p("### ✅ Successfully Triggered Workflows\n\n")
+        p("<details>\n")
+        p("<summary>Click to view gh CLI commands for triggered workflows</summary>\n\n")
+
+        for cmd_info in results['workflow_commands']:
+            artifact = cmd_info['artifact']
+            command = cmd_info['command']
+            p(f"#### {display(artifact.coordinates)}\n")
+            p(f"**Repository:** `{display(artifact.repository_url)}`\n\n")
+            p("```bash\n")
+            p(f"{command}\n")
+            p("```\n\n")
+
+        p("</details>\n\n")
+
+    # Failed workflows with commands
+    if results.get('failed_commands'):
+        p("### ❌ Failed Workflow Triggers\n\n")
+        p("<details>\n")
+        p("<summary>Click to view gh CLI commands for failed workflows</summary>\n\n")
+
+        for cmd_info in results['failed_commands']:
+            artifact = cmd_info['artifact']
+            command = cmd_info['command']
+            p(f"#### {display(artifact.coordinates)}\n")
+            p(f"**Repository:** `{display(artifact.repository_url)}`\n\n")
+            p("```bash\n")
+            p(f"{command}\n")
+            p("```\n\n")
+
+        p("</details>\n\n")
+
+    # Unresolved artifacts
+    if results['unresolved_artifacts']:
+        p("### ⚠️ Unresolved Artifacts (Manual Action Required)\n\n")
+        for artifact in results['unresolved_artifacts']:
+            p(f"- **{display(artifact.coordinates)}**\n")
+            p(f"  - Error: `{display(artifact.error)}`\n")
+        p("\n")
+
+    # Specific manual commands for each unresolved artifact
+    if results['unresolved_artifacts'] and results.get('workflow_config'):
+        p("### 🔧 Manual Resolution Commands\n\n")
+        p("For unresolved artifacts, once you've determined the repository URL, use these pre-filled commands:\n\n")
+
+        for artifact in results['unresolved_artifacts']:
+            manual_command = build_manual_command(artifact, config.get('repo', 'org/repo'),
+                                                  config.get('workflow', 'generate-mapping-workflow.yml'),
+                                                  config.get('ref', 'main'))
+            p(f"#### {display(artifact.coordinates)}\n")
+            p(f"**Error:** {display(artifact.error)}\n\n")
+            p(f"```bash\n{manual_command}\n```\n\n")
+
+        p("**Note:** Replace `<REPLACE_WITH_REPOSITORY_URL>` with the actual repository URL for each artifact.\n\n")
+
+    # Success status
+    if results['workflows_failed'] == 0 and results['workflows_triggered'] > 0:
+        p("\n✅ **All workflows triggered successfully!**\n")
+    elif results['workflows_failed'] > 0:
+        p(f"\n❌ **{results['workflows_failed']} workflow(s) failed to trigger**\n")
+    elif results['workflows_triggered'] == 0:
+        p("\n⚠️ **No workflows were triggered**\n")
+
     with open(summary_file, 'a') as f:
-        f.write("## 📊 Artifact Processing Summary\n\n")
-
-        # Statistics table
-        f.write("### Overall Statistics\n")
-        f.write("| Metric | Count |\n")
-        f.write("|--------|-------|\n")
-        f.write(f"| Total Artifacts | {results['total_artifacts']} |\n")
-        f.write(f"| Resolved | {results['resolved_count']} |\n")
-        f.write(f"| Unresolved | {results['unresolved_count']} |\n")
-        f.write(f"| Unique Repositories | {results['unique_repos']} |\n")
-        f.write(f"| Workflows Triggered | {results['workflows_triggered']} |\n")
-        f.write(f"| Workflows Failed | {results['workflows_failed']} |\n\n")
-
-        # Workflow configuration
-        config = results.get('workflow_config', {})
-        f.write("### Workflow Configuration\n")
-        f.write("| Parameter | Value |\n")
-        f.write("|-----------|-------|\n")
-        f.write(f"| Target Repository | `{config.get('repo', 'N/A')}` |\n")
-        f.write(f"| Workflow File | `{config.get('workflow', 'N/A')}` |\n")
-        f.write(f"| Git Ref | `{config.get('ref', 'N/A')}` |\n\n")
-
-        # Successfully triggered workflows with commands
-        if results.get('workflow_commands'):
-            f.write("### ✅ Successfully Triggered Workflows\n\n")
-            f.write("<details>\n")
-            f.write("<summary>Click to view gh CLI commands for triggered workflows</summary>\n\n")
-
-            for cmd_info in results['workflow_commands']:
-                artifact = cmd_info['artifact']
-                command = cmd_info['command']
-                f.write(f"#### {artifact.get('artifact', 'N/A')}\n")
-                f.write(f"**Repository:** `{artifact.get('repository_url', 'N/A')}`\n\n")
-                f.write("```bash\n")
-                f.write(f"{command}\n")
-                f.write("```\n\n")
-
-            f.write("</details>\n\n")
-
-        # Failed workflows with commands
-        if results.get('failed_commands'):
-            f.write("### ❌ Failed Workflow Triggers\n\n")
-            f.write("<details>\n")
-            f.write("<summary>Click to view gh CLI commands for failed workflows</summary>\n\n")
-
-            for cmd_info in results['failed_commands']:
-                artifact = cmd_info['artifact']
-                command = cmd_info['command']
-                f.write(f"#### {artifact.get('artifact', 'N/A')}\n")
-                f.write(f"**Repository:** `{artifact.get('repository_url', 'N/A')}`\n\n")
-                f.write("```bash\n")
-                f.write(f"{command}\n")
-                f.write("```\n\n")
-
-            f.write("</details>\n\n")
-
-        # Unresolved artifacts
-        if results['unresolved_artifacts']:
-            f.write("### ⚠️ Unresolved Artifacts (Manual Action Required)\n\n")
-            for artifact in results['unresolved_artifacts']:
-                f.write(f"- **{artifact.get('artifact', 'N/A')}**\n")
-                f.write(f"  - Error: `{artifact.get('error', 'N/A')}`\n")
-            f.write("\n")
-
-        # Specific manual commands for each unresolved artifact
-        if results['unresolved_artifacts'] and results.get('workflow_config'):
-            f.write("### 🔧 Manual Resolution Commands\n\n")
-            f.write("For unresolved artifacts, once you've determined the repository URL, use these pre-filled commands:\n\n")
-
-            for artifact in results['unresolved_artifacts']:
-                artifact_coords = artifact.get('artifact', 'N/A')
-                artifact_slug = artifact.get('artifact_id', 'N/A')
-
-                f.write(f"#### {artifact_coords}\n")
-                f.write(f"**Error:** {artifact.get('error', 'N/A')}\n\n")
-                f.write("```bash\n")
-                f.write(f"gh workflow run {config.get('workflow', 'generate-mapping-workflow.yml')} \\\n")
-                f.write(f"  --repo {config.get('repo', 'org/repo')} \\\n")
-                f.write(f"  --ref {config.get('ref', 'main')} \\\n")
-                f.write(f"  --field slug=\"{artifact_slug}\" \\\n")
-                f.write(f"  --field repo_url=\"<REPLACE_WITH_REPOSITORY_URL>\" \\\n")
-                f.write(f"  --field coordinates=\"{artifact_coords}\"\n")
-                f.write("```\n\n")
-
-            f.write("**Note:** Replace `<REPLACE_WITH_REPOSITORY_URL>` with the actual repository URL for each artifact.\n\n")
-
-        # Success status
-        if results['workflows_failed'] == 0 and results['workflows_triggered'] > 0:
-            f.write("\n✅ **All workflows triggered successfully!**\n")
-        elif results['workflows_failed'] > 0:
-            f.write(f"\n❌ **{results['workflows_failed']} workflow(s) failed to trigger**\n")
-        elif results['workflows_triggered'] == 0:
-            f.write("\n⚠️ **No workflows were triggered**\n")
+        f.write("".join(parts))
 
 if __name__ == "__main__":
-    import os
     sys.exit(main())
\ No newline at end of file
@@ -6,221 +6,445 @@ Enhanced to handle Apache projects specially.
 """
 
 import sys
-import urllib.request
+import hashlib
+import http.client
+import io
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
 import urllib.error
 import xml.etree.ElementTree as ET
-import json
 import re
 
-def fetch_url(url):
-    """Fetch URL content using urllib (no external dependencies)."""
+VERBOSE = '--verbose' in sys.argv
+NO_CACHE = '--no-cache' in sys.argv
+
+# Fetched POMs are cached on disk; release POMs never change, metadata does
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'saa', 'pom')
+METADATA_TTL = 3600
+
+# Overall time budget for resolving one artifact, across every fetch and retry
+RESOLVE_TIMEOUT = 30
+
+class HttpSession:
+    """
+    Keep-alive HTTP(S) connections reused across fetches.
+
+    http.client connections are not thread-safe, so each thread keeps its own
+    connection per host; a pool of N worker threads therefore holds at most N
+    connections per host. Requests failing with a connection error or one of
+    status_forcelist are retried with exponential backoff.
+
+    Maven Central's CDN drops idle keep-alive connections, so pooled
+    connections are recycled after connection_ttl seconds, and a request whose
+    retries all failed on connection errors gets one last attempt on a fresh,
+    non-pooled connection.
+
+    get() accepts a time.monotonic() deadline; no retry or fallback attempt is
+    started after it has passed.
+    """
+
+    def __init__(self, retries=4, backoff_factor=0.5,
+                 status_forcelist=(429, 500, 502, 503, 504), timeout=10,
+                 connection_ttl=120, max_redirects=5):
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = frozenset(status_forcelist)
+        self.timeout = timeout
+        self.connection_ttl = connection_ttl
+        self.max_redirects = max_redirects
+        self._local = threading.local()
+
+    def _connections(self):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+    def _new_connection(self, scheme, host):
+        conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return conn_class(host, timeout=self.timeout)
+
+    def _connection(self, scheme, host):
+        connections = self._connections()
+        entry = connections.get((scheme, host))
+        if entry is not None and time.monotonic() - entry[1] > self.connection_ttl:
+            entry[0].close()
+            entry = None
+        if entry is None:
+            entry = connections[(scheme, host)] = (self._new_connection(scheme, host), time.monotonic())
+        return entry[0]
+
+    def _discard(self, scheme, host):
+        entry = self._connections().pop((scheme, host), None)
+        if entry is not None:
+            entry[0].close()
+
+    @staticmethod
+    def _send(conn, path, headers=None):
+        conn.request('GET', path, headers=headers or {})
+        response = conn.getresponse()
+        return response, response.read()
+
+    @staticmethod
+    def _check_deadline(deadline, url):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Deadline exceeded fetching {url}")
+
+    def _request(self, url, deadline=None):
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                backoff = self.backoff_factor * (2 ** (attempt - 1))
+                if deadline is not None:
+                    backoff = min(backoff, max(deadline - time.monotonic(), 0))
+                time.sleep(backoff)
+            self._check_deadline(deadline, url)
+
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                response, body = self._send(conn, path)
+            except (http.client.HTTPException, OSError):
+                self._discard(parts.scheme, parts.netloc)
+                continue
+
+            if response.will_close:
+                self._discard(parts.scheme, parts.netloc)
+            if response.status in self.status_forcelist and attempt < self.retries:
+                continue
+            return response, body
+
+        # Every pooled attempt hit a connection error; try once without keep-alive
+        self._check_deadline(deadline, url)
+        conn = self._new_connection(parts.scheme, parts.netloc)
+        try:
+            return self._send(conn, path, {'Connection': 'close'})
+        finally:
+            conn.close()
+
+    def get(self, url, deadline=None):
+        """GET url, following redirects. Returns (status, reason, body bytes)."""
+        for _ in range(self.max_redirects + 1):
+            response, body = self._request(url, deadline)
+            location = response.getheader('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            return response.status, response.reason, body
+        return response.status, response.reason, body
+
+# Shared by every fetch that isn't given its own session, so a CLI run walking
+# the parent chain reuses one keep-alive connection to Maven Central
+_HTTP = HttpSession()
+
+def fetch_url(url, session=None, deadline=None):
+    """
+    Fetch URL content as bytes over a keep-alive HttpSession (no external
+    dependencies). Decoding is left to the XML parser, which honors the
+    document's encoding declaration.
+    """
     try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            return response.read().decode('utf-8')
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            return None
-        raise
+        status, reason, body = (session or _HTTP).get(url, deadline)
     except Exception as e:
         print(f"Error fetching {url}: {e}", file=sys.stderr)
         return None
+    if status == 404:
+        return None
+    if status >= 400:
+        raise urllib.error.HTTPError(url, status, reason, None, None)
+    return body
+
+def fetch_url_cached(url, ttl=None, session=None, deadline=None):
+    """
+    Fetch URL content through the on-disk cache, keyed by the SHA-1 of the URL.
+    Entries older than ttl seconds are refetched; ttl=None means they never expire.
+    """
+    if NO_CACHE:
+        return fetch_url(url, session, deadline)
+
+    path = os.path.join(CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.xml')
+    try:
+        if ttl is None or time.time() - os.path.getmtime(path) < ttl:
+            with open(path, 'rb') as f:
+                content = f.read()
+            if VERBOSE:
+                print(f"Cache hit: {url}", file=sys.stderr)
+            return content
+    except OSError:
+        pass
+
+    content = fetch_url(url, session, deadline)
+    if content is not None:
+        # Write to a temp file and rename so concurrent readers never see a partial file
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Warning: could not cache {url}: {e}", file=sys.stderr)
+    return content
+
+# scm:/git: prefixes plus the git protocol and SSH forms, rewritten to HTTPS in one pass
+_SCM_PREFIX = re.compile(r'^(?:scm:)?(?:git:(?!//))?(?:(git://|ssh://git@)|git@(github\.com|gitlab\.com|bitbucket\.org):)?')
+# .git suffix and anything after it
+_GIT_SUFFIX = re.compile(r'\.git.*')
+# Hosts whose project URLs point at the source repository
+_HOST_RE = re.compile(r'(?:github|gitlab)\.com|bitbucket\.org|sourceforge\.net')
+
+def _scm_prefix_replacement(match):
+    if match.group(1):
+        return 'https://'
+    if match.group(2):
+        return f"https://{match.group(2)}/"
+    return ''
 
 def clean_scm_url(url):
     """Clean various SCM URL formats to standard HTTPS URLs."""
     if not url:
         return None
 
-    if '--verbose' in sys.argv:
+    if VERBOSE:
         print(f"Starting url before cleaning: {url}", file=sys.stderr)
 
-    # Remove SCM prefixes
-    url = url.replace('scm:', '')
-
-    # Convert various formats to HTTPS
-    url = url.replace('git://', 'https://')
-    url = url.replace('ssh://git@', 'https://')
-    url = url.replace('git@github.com:', 'https://github.com/')
-    url = url.replace('git@gitlab.com:', 'https://gitlab.com/')
-    url = url.replace('git@bitbucket.org:', 'https://bitbucket.org/')
+    url = _SCM_PREFIX.sub(_scm_prefix_replacement, url.strip(), count=1)
+    return _GIT_SUFFIX.sub('', url).rstrip('/')
+
+_SCM_FIELDS = ('developerConnection', 'url', 'connection')
+
+# Root parents with no SCM information of their own, mapped to the GitHub
+# organization that hosts their children (None: give up, nothing to infer)
+_TERMINAL_PARENTS = {
+    ('org.sonatype.oss', 'oss-parent'): None,
+    ('org.apache', 'apache'): 'apache',
+}
+
+def parse_pom(content):
+    """
+    Stream a POM, collecting only the <project>-level fields needed to find its
+    repository: 'scm' (field -> text), 'url', 'parent' (child tag -> text) and
+    'artifactId'. Parsing stops as soon as an <scm> section with a value is read.
+    """
+    pom = {'scm': {}, 'url': None, 'parent': None, 'artifactId': None}
+    depth = 0
 
-    # remove prefix of git if exists
-    url = url.replace('git:', '')
+    for event, elem in ET.iterparse(io.BytesIO(content), events=('start', 'end')):
+        if event == 'start':
+            # Drop the namespace so tags can be matched by local name
+            elem.tag = elem.tag.rpartition('}')[2]
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        # A direct child of <project> is complete; keep what we need and free it
+        if elem.tag == 'scm':
+            pom['scm'] = {field: text for field in _SCM_FIELDS if (text := elem.findtext(field))}
+            if pom['scm']:
+                break
+        elif elem.tag == 'parent':
+            pom['parent'] = {child.tag: child.text for child in elem}
+        elif elem.tag in ('url', 'artifactId'):
+            pom[elem.tag] = elem.text
+        elem.clear()
 
-    # Remove .git suffix and anything after it
-    url = re.sub(re.escape(".git") + r'.*', '', url)
+    return pom
 
-    # Remove trailing slashes
-    url = url.rstrip('/')
+def get_repo_url(group_id, artifact_id, max_depth=10, fetch=None, deadline=None):
+    """
+    Find repository URL by traversing parent POMs.
 
-    return url
+    fetch(url, ttl) returns the document bytes or None; it defaults to the cached
+    fetch over the shared session. No fetch is started once the time.monotonic()
+    deadline has passed. Returns (url, None) or (None, reason).
+    """
+    if fetch is None:
+        fetch = fetch_url_cached
 
-def get_repo_url(group_id, artifact_id, max_depth=10):
-    """Find repository URL by traversing parent POMs."""
+    def timed_out():
+        return deadline is not None and time.monotonic() >= deadline
 
     group_path = group_id.replace('.', '/')
 
     # Step 1: Get latest version
     metadata_url = f"https://repo1.maven.org/maven2/{group_path}/{artifact_id}/maven-metadata.xml"
 
-    if '--verbose' in sys.argv:
+    if VERBOSE:
         print(f"Fetching metadata: {metadata_url}", file=sys.stderr)
 
-    metadata = fetch_url(metadata_url)
+    metadata = fetch(metadata_url, METADATA_TTL)
+    if timed_out():
+        return None, "Resolution timeout"
     if not metadata:
-        print(f"Failed to fetch metadata for {group_id}:{artifact_id}", file=sys.stderr)
-        return None
+        return None, f"Failed to fetch metadata for {group_id}:{artifact_id}"
 
     try:
         root = ET.fromstring(metadata)
-        version_elem = root.find('.//latest')
+        version_elem = root.find('versioning/latest')
         if version_elem is None:
-            version_elem = root.find('.//release')
+            version_elem = root.find('versioning/release')
         if version_elem is None:
             # Try to get the last version from versions list
-            versions = root.find('.//versions')
+            versions = root.find('versioning/versions')
             if versions is not None:
                 version_list = [v.text for v in versions.findall('version')]
                 if version_list:
                     version = version_list[-1]
                 else:
-                    print("No version found in metadata", file=sys.stderr)
-                    return None
+                    return None, "No version found in metadata"
             else:
-                print("No version found in metadata", file=sys.stderr)
-                return None
+                return None, "No version found in metadata"
         else:
             version = version_elem.text
 
-        if '--verbose' in sys.argv:
+        if VERBOSE:
             print(f"Found version: {version}", file=sys.stderr)
 
     except ET.ParseError as e:
-        print(f"Error parsing metadata XML: {e}", file=sys.stderr)
-        return None
+        return None, f"Error parsing metadata XML: {e}"
 
     # Step 2: Traverse POMs looking for SCM info
     current_group = group_id
     current_artifact = artifact_id
     current_version = version
     depth = 0
+    reason = f"Repository URL not found for {group_id}:{artifact_id}"
 
     while depth < max_depth:
+        if timed_out():
+            return None, "Resolution timeout"
+
         group_path = current_group.replace('.', '/')
         pom_url = f"https://repo1.maven.org/maven2/{group_path}/{current_artifact}/{current_version}/{current_artifact}-{current_version}.pom"
 
-        if '--verbose' in sys.argv:
+        if VERBOSE:
             print(f"Fetching POM (depth {depth}): {pom_url}", file=sys.stderr)
 
-        pom_content = fetch_url(pom_url)
+        pom_content = fetch(pom_url, None)
         if not pom_content:
-            print(f"Failed to fetch POM: {pom_url}", file=sys.stderr)
+            if timed_out():
+                return None, "Resolution timeout"
+            reason = f"Failed to fetch POM: {pom_url}"
             break
 
         try:
-            root = ET.fromstring(pom_content)
-
-            # Remove namespace for easier parsing
-            for elem in root.iter():
-                if '}' in elem.tag:
-                    elem.tag = elem.tag.split('}')[1]
-
-            # Check for SCM section
-            scm = root.find('.//scm')
-            if scm is not None:
-                # Try different SCM fields
-                for field in ['developerConnection', 'url', 'connection']:
-                    elem = scm.find(field)
-                    if elem is not None and elem.text:
-                        cleaned_url = clean_scm_url(elem.text)
-                        if cleaned_url:
-                            if '--verbose' in sys.argv:
-                                print(f"Found SCM URL in {field}: {cleaned_url}", file=sys.stderr)
-                            return cleaned_url
-
-            # Check project URL as fallback
-            url_elem = root.find('.//url')
-            if url_elem is not None and url_elem.text:
-                url = url_elem.text.strip()
-                # Check if it's a repo URL
-                if any(host in url for host in ['github.com', 'gitlab.com', 'bitbucket.org', 'sourceforge.net']):
-                    if '--verbose' in sys.argv:
-                        print(f"Found project URL: {url}", file=sys.stderr)
-                    return url
-
-            # Continue to parent if exists
-            if parent is not None:
-                parent_group = parent.find('groupId')
-                parent_artifact = parent.find('artifactId')
-                parent_version = parent.find('version')
-
-                if (parent_group is not None and parent_group.text == 'org.sonatype.oss' and
-                        parent_artifact is not None and parent_artifact.text == 'oss-parent'):
-
-                    if '--verbose' in sys.argv:
-                        print(f"Found Sonatype root parent, stopping traversal as there is no information available", file=sys.stderr)
-
-                    return None
-
-                    # Check if the parent is the Apache root POM
-                if (parent_group is not None and parent_group.text == 'org.apache' and
-                        parent_artifact is not None and parent_artifact.text == 'apache'):
-
-                    if '--verbose' in sys.argv:
-                        print(f"Found Apache root parent, stopping traversal", file=sys.stderr)
-
-                    # Get the artifactId from the current POM (not the parent)
-                    current_artifact_elem = root.find('artifactId')
-                    if current_artifact_elem is not None and current_artifact_elem.text:
-                        project_name = current_artifact_elem.text
-
-                        # Construct and return the GitHub URL
-                        github_url = f"https://github.com/apache/{project_name}"
-
-                        if '--verbose' in sys.argv:
-                            print(f"Using current POM artifactId: {project_name}", file=sys.stderr)
-                            print(f"Returning Apache GitHub URL: {github_url}", file=sys.stderr)
-
-                        return github_url
-
-                if all(elem is not None and elem.text for elem in [parent_group, parent_artifact, parent_version]):
-                    current_group = parent_group.text
-                    current_artifact = parent_artifact.text
-                    current_version = parent_version.text
-
-                    if '--verbose' in sys.argv:
-                        print(f"Following parent: {current_group}:{current_artifact}:{current_version}", file=sys.stderr)
-
-                    depth += 1
-                else:
-                    break
-            else:
-                if '--verbose' in sys.argv:
-                    print("No parent POM found", file=sys.stderr)
-                break
-
+            pom = parse_pom(pom_content)
         except ET.ParseError as e:
-            print(f"Error parsing POM: {e}", file=sys.stderr)
+            reason = f"Error parsing POM: {e}"
+            break
+
+        # Check for SCM section, trying the different SCM fields
+        for field in _SCM_FIELDS:
+            text = pom['scm'].get(field)
+            if text:
+                cleaned_url = clean_scm_url(text)
+                if cleaned_url:
+                    if VERBOSE:
+                        print(f"Found SCM URL in {field}: {cleaned_url}", file=sys.stderr)
+                    return cleaned_url, None
+
+        # Check project URL as fallback
+        if pom['url']:
+            url = pom['url'].strip()
+            # Check if it's a repo URL
+            if _HOST_RE.search(url):
+                if VERBOSE:
+                    print(f"Found project URL: {url}", file=sys.stderr)
+                return url, None
+
+        # Continue to parent if exists
+        parent = pom['parent']
+        if parent is None:
+            if VERBOSE:
+                print("No parent POM found", file=sys.stderr)
             break
 
-    return None
+        parent_group = parent.get('groupId')
+        parent_artifact = parent.get('artifactId')
+        parent_version = parent.get('version')
+
+        # Well-known root parents end the traversal
+        key = (parent_group, parent_artifact)
+        if key in _TERMINAL_PARENTS:
+            github_org = _TERMINAL_PARENTS[key]
+            if github_org is None:
+                if VERBOSE:
+                    print(f"Found {parent_group}:{parent_artifact} root parent, stopping traversal as there is no information available", file=sys.stderr)
+
+                return None, f"Reached the {parent_group}:{parent_artifact} root parent without SCM information"
+
+            if VERBOSE:
+                print(f"Found {parent_group}:{parent_artifact} root parent, stopping traversal", file=sys.stderr)
+
+            # Use the artifactId from the current POM (not the parent)
+            project_name = pom['artifactId']
+            if project_name:
+                github_url = f"https://github.com/{github_org}/{project_name}"
+
+                if VERBOSE:
+                    print(f"Using current POM artifactId: {project_name}", file=sys.stderr)
+                    print(f"Returning GitHub URL: {github_url}", file=sys.stderr)
+
+                return github_url, None
+
+        if not (parent_group and parent_artifact and parent_version):
+            break
+
+        current_group = parent_group
+        current_artifact = parent_artifact
+        current_version = parent_version
+
+        if VERBOSE:
+            print(f"Following parent: {current_group}:{current_artifact}:{current_version}", file=sys.stderr)
+
+        depth += 1
+
+    return None, reason
+
+def resolve(artifact, session=None, timeout=RESOLVE_TIMEOUT):
+    """
+    Resolve a groupId:artifactId coordinate within timeout seconds, raising
+    LookupError if no URL is found.
+    """
+    group_id, artifact_id = artifact.split(':', 1)
+    deadline = time.monotonic() + timeout
+    fetch = lambda url, ttl: fetch_url_cached(url, ttl, session, deadline)
+    repo_url, reason = get_repo_url(group_id, artifact_id, fetch=fetch, deadline=deadline)
+    if reason == "Resolution timeout":
+        reason = f"Resolution timeout ({timeout}s)"
+    if not repo_url:
+        raise LookupError(reason)
+    return repo_url
 
 def main():
     if len(sys.argv) < 2 or ':' not in sys.argv[1]:
-        print("Usage: ./get-repo-url.py groupId:artifactId [--verbose]")
+        print("Usage: ./get-repo-url.py groupId:artifactId [--verbose] [--no-cache]")
         print("Example: ./get-repo-url.py org.jolokia:jolokia-support-spring")
         print("         ./get-repo-url.py net.javacrumbs.shedlock:shedlock-spring --verbose")
         print("         ./get-repo-url.py org.apache.camel:camel-spring-main --verbose")
         sys.exit(1)
 
-    group_id, artifact_id = sys.argv[1].split(':', 1)
-    repo_url = get_repo_url(group_id, artifact_id)
-
-    if repo_url:
-        print(repo_url)
-        sys.exit(0)
-    else:
-        print(f"Repository URL not found for {group_id}:{artifact_id}", file=sys.stderr)
+    try:
+        repo_url = resolve(sys.argv[1])
+    except LookupError as e:
+        print(e, file=sys.stderr)
         sys.exit(1)
 
+    print(repo_url)
+    sys.exit(0)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file